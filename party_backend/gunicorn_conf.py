@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration for production deployments.
+
+Run:  gunicorn -c gunicorn_conf.py src.api.main:app
+
+Uses uvicorn's ASGI worker with the usual 2*cores+1 sizing so CPU-bound
+work (bcrypt hashing during auth) scales across cores instead of
+serializing on a single process.
+"""
+
+import multiprocessing
+import os
+
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = os.getenv("BIND", "0.0.0.0:8000")
+keepalive = 5
+# Import the app once in the master before forking; the SQLAlchemy engine's
+# connection pool is lazy, so each worker still opens its own connections.
+preload_app = True
@@ -0,0 +1,22 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# PUBLIC_INTERFACE
+class Settings(BaseSettings):
+    """
+    Typed application settings, parsed from the environment (and .env) once
+    at import. Missing or invalid values fail at boot, not at first request.
+    """
+
+    database_url: str
+    jwt_secret_key: str = "temporary_secret"  # Use better/secure key in production
+    jwt_algorithm: str = "HS256"
+    jwt_expire_minutes: int = 30
+    allowed_origins: str = "http://localhost:3000"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    env: str = "production"
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+
+settings = Settings()
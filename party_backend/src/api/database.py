@@ -1,19 +1,22 @@
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
+
+from .config import settings
 
 # PUBLIC_INTERFACE
 def get_database_url():
     """
-    Returns the database URL from environment variables.
-
-    Raises:
-        RuntimeError: If the database URL is not set.
+    Returns the configured database URL, normalized to an async driver
+    (asyncpg for PostgreSQL, aiosqlite for SQLite).
     """
-    # Conventional variable names you may need to update depending on actual .env
-    url = os.getenv('DATABASE_URL')
-    if not url:
-        raise RuntimeError("DATABASE_URL environment variable is not set!")
+    url = settings.database_url
+    if url.startswith("postgresql+psycopg2://"):
+        url = url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    elif url.startswith("postgresql://"):
+        url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    elif url.startswith("sqlite://"):
+        url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
     return url
 
 # Set up the SQLAlchemy Base
@@ -22,5 +25,33 @@ Base = declarative_base()
 # Create engine and session factory using DATABASE_URL
 DATABASE_URL = get_database_url()
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pool sized for multi-worker deployments; pool_recycle avoids handing out
+# connections that a proxy/server already closed, pool_timeout fails fast
+# instead of queueing indefinitely when the pool is exhausted. The QueuePool
+# sizing kwargs only apply to PostgreSQL: aiosqlite defaults to NullPool,
+# which rejects them.
+_engine_kwargs = dict(
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
+if DATABASE_URL.startswith("postgresql+asyncpg://"):
+    _engine_kwargs.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=10,
+        connect_args={"server_settings": {"application_name": "party_backend"}},
+    )
+
+engine = create_async_engine(DATABASE_URL, **_engine_kwargs)
+
+if engine.dialect.name == "sqlite":
+    # SQLite ignores ON DELETE CASCADE (and FK constraints generally) unless
+    # enforcement is switched on per connection.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+# expire_on_commit=False so returned objects stay readable after commit
+# without implicit (and, under asyncio, forbidden) lazy refreshes.
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
@@ -1,52 +1,82 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from cachetools import TTLCache
+from datetime import datetime, timedelta, timezone
 from . import database, models
-import os
+from .config import settings
+import hashlib
+import threading
+import time
+
+from typing import NamedTuple, Optional
 
-from typing import Optional
 
-SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'temporary_secret')  # Use better/secure key in production
-ALGORITHM = "HS256"
+class CurrentUser(NamedTuple):
+    """Lightweight authenticated-user handle; handlers only need id/email."""
+    id: int
+    email: str
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 # PUBLIC_INTERFACE
-def get_db():
+async def get_db():
     """
     FastAPI dependency for DB session.
     """
-    db = database.SessionLocal()
-    try:
+    async with database.SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-# Hashing helpers (for demonstration, use passlib in production)
-import hashlib
+# Hashing helpers
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=12, deprecated="auto")
 
 def hash_password(password: str) -> str:
     """
-    Hashes password using SHA256 (not secure for production!).
+    Hashes password using bcrypt (salted, adaptive cost).
     """
-    return hashlib.sha256(password.encode()).hexdigest()
+    return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return hash_password(plain_password) == hashed_password
+    return pwd_context.verify(plain_password, hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    True if the stored hash was made with outdated settings (e.g. fewer
+    rounds) and should be re-hashed on next successful login.
+    """
+    return pwd_context.needs_update(hashed_password)
 
 # Token helpers
-def create_access_token(data: dict, expires_delta=None):
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
-    Creates a JWT access token.
+    Creates a JWT access token with iat/exp claims.
+    Expires after settings.jwt_expire_minutes unless expires_delta is given.
     """
     to_encode = data.copy()
-    # Expiry logic could go here
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    if "sub" in to_encode:
+        to_encode["sub"] = str(to_encode["sub"])  # RFC 7519 requires sub to be a string
+    now = datetime.now(timezone.utc)
+    to_encode.update({
+        "iat": now,
+        "exp": now + (expires_delta or timedelta(minutes=settings.jwt_expire_minutes)),
+    })
+    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
+# Cache decode/lookup results (as plain CurrentUser tuples) so a hot client
+# hitting many endpoints back-to-back skips the HMAC verify and the user
+# SELECT. Entries live at most 5 minutes, bounded further by the token's own
+# exp claim when set.
+_TOKEN_CACHE_TTL = 300
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=_TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
 # PUBLIC_INTERFACE
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> models.User:
+async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)) -> CurrentUser:
     """
     Dependency to get the current authenticated user.
     Raises HTTP 401 if user/token invalid.
@@ -56,15 +86,31 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        user, token_exp = cached
+        if token_exp is None or time.time() < token_exp:
+            return user
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: Optional[int] = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        payload = jwt.decode(
+            token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm],
+            options={"require_exp": True, "require_sub": True},
+        )
+        user_id = int(payload["sub"])
+    except (JWTError, ValueError):
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if user is None:
+    # Fetch only the columns handlers use instead of hydrating the full row
+    # (hashed_password, relationship loaders, ...).
+    row = (await db.execute(
+        select(models.User.id, models.User.email).where(models.User.id == user_id)
+    )).first()
+    if row is None:
         raise credentials_exception
+    user = CurrentUser(id=row.id, email=row.email)
+    with _token_cache_lock:
+        _token_cache[cache_key] = (user, payload.get("exp"))
     return user
@@ -1,12 +1,22 @@
 from fastapi import FastAPI, Depends, HTTPException, Path
 from fastapi import APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
 from typing import List
 
+from . import database
 from . import models
 from . import schemas
-from .deps import get_db, hash_password, verify_password, create_access_token, get_current_user
+from .config import settings
+from .deps import (
+    CurrentUser, get_db, hash_password, verify_password, password_needs_rehash,
+    create_access_token, get_current_user,
+)
 from fastapi.security import OAuth2PasswordRequestForm
 
 app = FastAPI(
@@ -19,16 +29,46 @@ app = FastAPI(
         {"name": "guests", "description": "Guest/invitation management"},
         {"name": "rsvps", "description": "RSVP management"}
     ],
+    default_response_class=ORJSONResponse,
 )
 
+# Compress responses above 1 KB (large event lists with long descriptions);
+# level 5 is close to max ratio at a fraction of the CPU cost.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Browsers ignore credentials with a wildcard origin anyway; use an explicit
+# origin list and let browsers cache the preflight response for a day.
+_allowed_origins = [
+    origin.strip()
+    for origin in settings.allowed_origins.split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=_allowed_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
+if settings.env == "dev":
+    from .profiling import setup_query_warnings
+    setup_query_warnings(app)
+
+def _dialect_insert():
+    """
+    Return the INSERT construct supporting ON CONFLICT for the configured
+    dialect (PostgreSQL in production, SQLite in local/dev setups).
+    """
+    if database.engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    return dialect_insert
+
+
 @app.get("/", tags=["health"])
 def health_check():
     """
@@ -43,33 +83,44 @@ auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
 # PUBLIC_INTERFACE
 @auth_router.post("/signup", response_model=schemas.UserOut, summary="Sign up user")
-def signup(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
-    existing = db.query(models.User).filter(
-        (models.User.username == user_data.username) | (models.User.email == user_data.email)
-    ).first()
+    existing = (await db.execute(
+        select(models.User).where(
+            (models.User.username == user_data.username) | (models.User.email == user_data.email)
+        )
+    )).scalars().first()
     if existing:
         raise HTTPException(status_code=400, detail="Username or Email already exists.")
-    hashed = hash_password(user_data.password)
+    # bcrypt is deliberately slow; run it on the threadpool so it doesn't
+    # block the event loop.
+    hashed = await run_in_threadpool(hash_password, user_data.password)
     user = models.User(
         username=user_data.username,
         email=user_data.email,
         hashed_password=hashed
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    # Flush-on-commit backfills the PK via RETURNING and expire_on_commit is
+    # off, so no refresh SELECT is needed before returning.
+    await db.commit()
     return user
 
 # PUBLIC_INTERFACE
 @auth_router.post("/login", response_model=schemas.Token, summary="Login user")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Authenticate a user and return a JWT token.
     """
-    user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = (await db.execute(
+        select(models.User).where(models.User.username == form_data.username)
+    )).scalars().first()
+    if not user or not await run_in_threadpool(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Incorrect username or password")
+    if password_needs_rehash(user.hashed_password):
+        # Opportunistically re-hash so bcrypt rounds can be raised over time.
+        user.hashed_password = await run_in_threadpool(hash_password, form_data.password)
+        await db.commit()
     token = create_access_token({"sub": user.id})
     return schemas.Token(access_token=token, token_type="bearer")
 
@@ -80,73 +131,99 @@ event_router = APIRouter(prefix="/events", tags=["events"])
 
 # PUBLIC_INTERFACE
 @event_router.post("/", response_model=schemas.EventOut, summary="Create event")
-def create_event(
+async def create_event(
     event_data: schemas.EventCreate,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)):
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)):
     """Create a new event for current user."""
-    event = models.Event(**event_data.dict(), owner_id=user.id)
+    event = models.Event(**event_data.model_dump(), owner_id=user.id)
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     return event
 
 # PUBLIC_INTERFACE
 @event_router.get("/", response_model=List[schemas.EventOut], summary="List all events")
-def list_events(
-    db: Session = Depends(get_db),
+async def list_events(
+    db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 50,
-    user: models.User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """List all events for the current user."""
-    return db.query(models.Event).filter(models.Event.owner_id == user.id).offset(skip).limit(limit).all()
+    # selectinload keeps relationship access at one extra IN query per
+    # collection instead of one lazy SELECT per event (N+1).
+    result = await db.execute(
+        select(models.Event)
+        .options(selectinload(models.Event.guests), selectinload(models.Event.rsvps))
+        .where(models.Event.owner_id == user.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
 
 # PUBLIC_INTERFACE
 @event_router.get("/{event_id}", response_model=schemas.EventOut, summary="Get event details")
-def get_event(
+async def get_event(
     event_id: int = Path(..., description="ID of the event"),
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
 ):
     """Get a specific event."""
-    event = db.query(models.Event).filter(models.Event.id == event_id, models.Event.owner_id == user.id).first()
+    event = (await db.execute(
+        select(models.Event)
+        .options(selectinload(models.Event.guests), selectinload(models.Event.rsvps))
+        .where(models.Event.id == event_id, models.Event.owner_id == user.id)
+    )).scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 # PUBLIC_INTERFACE
 @event_router.put("/{event_id}", response_model=schemas.EventOut, summary="Update event")
-def update_event(
+async def update_event(
     event_id: int,
     event_update: schemas.EventUpdate,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """Update an event. Only owner can update."""
-    event = db.query(models.Event).filter(models.Event.id == event_id, models.Event.owner_id == user.id).first()
+    values = event_update.model_dump(exclude_unset=True)
+    if values:
+        # Fold the ownership check into the UPDATE itself: one round trip,
+        # and rowcount 0 doubles as "not found or not owner".
+        event = (await db.scalars(
+            update(models.Event)
+            .where(models.Event.id == event_id, models.Event.owner_id == user.id)
+            .values(**values)
+            .returning(models.Event)
+        )).first()
+    else:
+        event = (await db.execute(
+            select(models.Event).where(models.Event.id == event_id, models.Event.owner_id == user.id)
+        )).scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    for field, value in event_update.dict(exclude_unset=True).items():
-        setattr(event, field, value)
-    db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     return event
 
 # PUBLIC_INTERFACE
 @event_router.delete("/{event_id}", response_model=dict, summary="Delete event")
-def delete_event(
+async def delete_event(
     event_id: int,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """Delete an event."""
-    event = db.query(models.Event).filter(models.Event.id == event_id, models.Event.owner_id == user.id).first()
-    if not event:
+    # Single ownership-checked DELETE; guests/rsvps go with it via the
+    # ON DELETE CASCADE foreign keys.
+    deleted_id = (await db.scalars(
+        delete(models.Event)
+        .where(models.Event.id == event_id, models.Event.owner_id == user.id)
+        .returning(models.Event.id)
+    )).first()
+    if deleted_id is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    db.delete(event)
-    db.commit()
+    await db.commit()
     return {"detail": "Event deleted"}
 
 
@@ -156,14 +233,16 @@ guest_router = APIRouter(prefix="/events/{event_id}/guests", tags=["guests"])
 
 # PUBLIC_INTERFACE
 @guest_router.post("/", response_model=schemas.GuestOut, summary="Add guest to event")
-def add_guest(
+async def add_guest(
     event_id: int,
     guest: schemas.GuestCreate,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """Add a guest to an event (must be owner)."""
-    event = db.query(models.Event).filter(models.Event.id == event_id, models.Event.owner_id == user.id).first()
+    event = (await db.execute(
+        select(models.Event).where(models.Event.id == event_id, models.Event.owner_id == user.id)
+    )).scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     new_guest = models.Guest(
@@ -174,22 +253,24 @@ def add_guest(
         responded=False
     )
     db.add(new_guest)
-    db.commit()
-    db.refresh(new_guest)
+    await db.commit()
     return new_guest
 
 # PUBLIC_INTERFACE
 @guest_router.get("/", response_model=List[schemas.GuestOut], summary="List event guests")
-def list_guests(
+async def list_guests(
     event_id: int,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """List all guests for an event (owner only)."""
-    event = db.query(models.Event).filter(models.Event.id == event_id, models.Event.owner_id == user.id).first()
+    event = (await db.execute(
+        select(models.Event).where(models.Event.id == event_id, models.Event.owner_id == user.id)
+    )).scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    return db.query(models.Guest).filter(models.Guest.event_id == event_id).all()
+    result = await db.execute(select(models.Guest).where(models.Guest.event_id == event_id))
+    return result.scalars().all()
 
 
 # ========== INVITE (BATCH) ROUTES ==========
@@ -198,33 +279,51 @@ invite_router = APIRouter(prefix="/events/{event_id}/invite", tags=["guests"])
 
 # PUBLIC_INTERFACE
 @invite_router.post("/", response_model=List[schemas.GuestOut], summary="Invite (batch add) guests by email")
-def invite_guests(
+async def invite_guests(
     event_id: int,
     invite_request: schemas.InviteRequest,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """Batch invite guests to an event (owner only, by email)."""
-    event = db.query(models.Event).filter(models.Event.id == event_id, models.Event.owner_id == user.id).first()
+    event = (await db.execute(
+        select(models.Event).where(models.Event.id == event_id, models.Event.owner_id == user.id)
+    )).scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    guests = []
+    # One SELECT for the already-invited emails, one bulk INSERT for the
+    # delta, instead of a SELECT + INSERT round trip per email.
+    existing = set((await db.execute(
+        select(models.Guest.email).where(
+            models.Guest.event_id == event_id,
+            models.Guest.email.in_(invite_request.guest_emails),
+        )
+    )).scalars())
+    new_rows = []
     for email in invite_request.guest_emails:
-        guest = db.query(models.Guest).filter(models.Guest.event_id == event_id, models.Guest.email == email).first()
-        if not guest:
-            new_guest = models.Guest(
-                event_id=event_id,
-                name=email.split('@')[0],  # Default to prefix of email for name
-                email=email,
-                invited_by_user_id=user.id,
-                responded=False
-            )
-            db.add(new_guest)
-            guests.append(new_guest)
-    db.commit()
-    # Refresh all returned
-    for g in guests:
-        db.refresh(g)
+        if email in existing:
+            continue
+        existing.add(email)  # Also guards against duplicates in the request
+        new_rows.append({
+            "event_id": event_id,
+            "name": email.split('@')[0],  # Default to prefix of email for name
+            "email": email,
+            "invited_by_user_id": user.id,
+            "responded": False,
+        })
+    if not new_rows:
+        return []
+    # ON CONFLICT DO NOTHING makes the insert race-free against concurrent
+    # invites of the same email: the uq_guest_event_email constraint swallows
+    # the duplicate instead of raising, and RETURNING yields only the rows
+    # actually inserted.
+    guests = (await db.scalars(
+        _dialect_insert()(models.Guest)
+        .values(new_rows)
+        .on_conflict_do_nothing(index_elements=["event_id", "email"])
+        .returning(models.Guest)
+    )).all()
+    await db.commit()
     return guests
 
 # ========== RSVP ROUTES ==========
@@ -233,53 +332,57 @@ rsvp_router = APIRouter(prefix="/events/{event_id}/rsvp", tags=["rsvps"])
 
 # PUBLIC_INTERFACE
 @rsvp_router.post("/", response_model=schemas.RSVPOut, summary="RSVP to event")
-def rsvp_to_event(
+async def rsvp_to_event(
     event_id: int,
     rsvp: schemas.RSVPCreate,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """
     RSVP to an event (by guest/user). Will create or update an RSVP record.
     """
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
+    # Only RSVP to events user is a guest of, or owner. One round trip:
+    # fetch the owner together with an EXISTS over the guest list instead of
+    # loading the event and a guest row separately.
+    is_guest = (
+        select(models.Guest.id)
+        .where(models.Guest.event_id == event_id, models.Guest.email == user.email)
+        .exists()
+    )
+    row = (await db.execute(
+        select(models.Event.owner_id, is_guest.label("is_guest")).where(models.Event.id == event_id)
+    )).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Event not found")
-
-    # Only RSVP to events user is a guest of, or owner
-    guest = db.query(models.Guest).filter(models.Guest.event_id == event_id, models.Guest.email == user.email).first()
-    if not guest and event.owner_id != user.id:
+    if not row.is_guest and row.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Must be invited or owner")
 
-    # Check if RSVP exists
-    rsvp_obj = db.query(models.RSVP).filter(models.RSVP.event_id == event_id, models.RSVP.user_id == user.id).first()
-    if not rsvp_obj:
-        rsvp_obj = models.RSVP(
-            event_id=event_id,
-            user_id=user.id,
-            status=rsvp.status
-        )
-        db.add(rsvp_obj)
-        db.commit()
-        db.refresh(rsvp_obj)
-    else:
-        rsvp_obj.status = rsvp.status
-        db.commit()
-        db.refresh(rsvp_obj)
+    # Upsert in a single statement: the uq_rsvp_event_user constraint makes
+    # create-or-update race-free without a pre-check SELECT.
+    stmt = (
+        _dialect_insert()(models.RSVP)
+        .values(event_id=event_id, user_id=user.id, status=rsvp.status)
+        .on_conflict_do_update(index_elements=["event_id", "user_id"], set_={"status": rsvp.status})
+        .returning(models.RSVP)
+    )
+    rsvp_obj = (await db.scalars(stmt)).one()
+    await db.commit()
     return rsvp_obj
 
 # PUBLIC_INTERFACE
 @rsvp_router.get("/", response_model=schemas.RSVPOut, summary="Get user's RSVP status")
-def get_my_rsvp_status(
+async def get_my_rsvp_status(
     event_id: int,
-    db: Session = Depends(get_db),
-    user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """Get the current user's RSVP status for an event."""
-    rsvp = db.query(models.RSVP).filter(
-        models.RSVP.event_id == event_id,
-        models.RSVP.user_id == user.id
-    ).first()
+    rsvp = (await db.execute(
+        select(models.RSVP).where(
+            models.RSVP.event_id == event_id,
+            models.RSVP.user_id == user.id
+        )
+    )).scalars().first()
     if not rsvp:
         raise HTTPException(status_code=404, detail="RSVP not found")
     return rsvp
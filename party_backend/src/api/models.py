@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -26,23 +26,24 @@ class Event(Base):
     description = Column(Text)
     date = Column(DateTime, nullable=False)
     location = Column(String(256), nullable=False)
-    owner_id = Column(Integer, ForeignKey("users.id"))
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True)
 
     owner = relationship("User", back_populates="events")
-    guests = relationship("Guest", back_populates="event", cascade="all, delete-orphan")
-    rsvps = relationship("RSVP", back_populates="event", cascade="all, delete-orphan")
+    guests = relationship("Guest", back_populates="event", cascade="all, delete-orphan", passive_deletes=True)
+    rsvps = relationship("RSVP", back_populates="event", cascade="all, delete-orphan", passive_deletes=True)
 
 
 # PUBLIC_INTERFACE
 class Guest(Base):
     """Guests invited to events."""
     __tablename__ = "guests"
+    __table_args__ = (UniqueConstraint("event_id", "email", name="uq_guest_event_email"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    event_id = Column(Integer, ForeignKey("events.id"))
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"))
     name = Column(String(128), nullable=False)
     email = Column(String(128), nullable=False)
-    invited_by_user_id = Column(Integer, ForeignKey("users.id"))
+    invited_by_user_id = Column(Integer, ForeignKey("users.id"), index=True)
     responded = Column(Boolean, default=False)
 
     event = relationship("Event", back_populates="guests")
@@ -52,10 +53,11 @@ class Guest(Base):
 class RSVP(Base):
     """Tracks RSVP status for users and events."""
     __tablename__ = "rsvps"
+    __table_args__ = (UniqueConstraint("event_id", "user_id", name="uq_rsvp_event_user"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    event_id = Column(Integer, ForeignKey("events.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     status = Column(String(16), nullable=False)  # e.g. 'accepted', 'declined', 'maybe'
 
     event = relationship("Event", back_populates="rsvps")
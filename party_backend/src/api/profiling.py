@@ -0,0 +1,52 @@
+"""
+Dev-only query profiling to guard against N+1 regressions.
+
+nplusone has no ASGI/FastAPI integration, and under async SQLAlchemy an
+unintended lazy load already raises (MissingGreenlet). What it cannot
+catch is a handler quietly issuing one explicit query per row, so this
+module counts SQL statements per request and logs a warning when a
+request exceeds a threshold. Enabled from main.py when ENV=dev.
+"""
+
+import logging
+import os
+from contextvars import ContextVar
+
+from sqlalchemy import event as sa_event
+
+from . import database
+
+logger = logging.getLogger("party_backend.queries")
+
+_request_statements: ContextVar = ContextVar("request_statements", default=None)
+
+# PUBLIC_INTERFACE
+def setup_query_warnings(app):
+    """
+    Attach a per-request SQL statement counter to the app.
+
+    Logs a warning whenever a single request issues more than
+    QUERY_WARN_THRESHOLD statements (default 10) - the usual N+1 signature.
+    """
+    threshold = int(os.getenv("QUERY_WARN_THRESHOLD", "10"))
+
+    @sa_event.listens_for(database.engine.sync_engine, "after_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements = _request_statements.get()
+        if statements is not None:
+            statements.append(statement)
+
+    @app.middleware("http")
+    async def _warn_on_query_storms(request, call_next):
+        token = _request_statements.set([])
+        try:
+            response = await call_next(request)
+        finally:
+            statements = _request_statements.get()
+            _request_statements.reset(token)
+        if len(statements) > threshold:
+            logger.warning(
+                "%s %s issued %d SQL statements (threshold %d) - possible N+1",
+                request.method, request.url.path, len(statements), threshold,
+            )
+        return response
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 # User Schemas
 # PUBLIC_INTERFACE
@@ -14,8 +14,7 @@ class UserCreate(UserBase):
 class UserOut(UserBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # PUBLIC_INTERFACE
 class UserLogin(BaseModel):
@@ -49,8 +48,7 @@ class EventOut(EventBase):
     id: int
     owner_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # PUBLIC_INTERFACE
 class GuestBase(BaseModel):
@@ -64,8 +62,7 @@ class GuestOut(GuestBase):
     id: int
     event_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # PUBLIC_INTERFACE
 class RSVPBase(BaseModel):
@@ -79,8 +76,7 @@ class RSVPOut(RSVPBase):
     event_id: int
     user_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # PUBLIC_INTERFACE
 class InviteRequest(BaseModel):